@@ -13,47 +13,61 @@ Generate approximately 100 customers, 50 products across 10 categories,
 200 orders, and corresponding order items with realistic relationships.
 """
 
-import random
-import json
 from datetime import datetime, timedelta
+import numpy as np
+import orjson
 from faker import Faker
 
 fake = Faker()
+rng = np.random.default_rng()
+
+# Each table is held column-wise as {column_name: ndarray or list}, one entry per row
 
 def generate_categories():
     """Generate product categories"""
-    categories = [
-        {"id": 1, "name": "Electronics", "description": "Electronic devices and gadgets"},
-        {"id": 2, "name": "Clothing", "description": "Fashion and apparel"},
-        {"id": 3, "name": "Books", "description": "Books and literature"},
-        {"id": 4, "name": "Home & Garden", "description": "Home improvement and gardening"},
-        {"id": 5, "name": "Sports", "description": "Sports and fitness equipment"},
-        {"id": 6, "name": "Beauty", "description": "Beauty and personal care"},
-        {"id": 7, "name": "Toys", "description": "Toys and games"},
-        {"id": 8, "name": "Automotive", "description": "Car parts and accessories"},
-        {"id": 9, "name": "Food", "description": "Food and beverages"},
-        {"id": 10, "name": "Health", "description": "Health and wellness products"}
-    ]
+    categories = {
+        "id": np.arange(1, 11),
+        "name": [
+            "Electronics", "Clothing", "Books", "Home & Garden", "Sports",
+            "Beauty", "Toys", "Automotive", "Food", "Health"
+        ],
+        "description": [
+            "Electronic devices and gadgets",
+            "Fashion and apparel",
+            "Books and literature",
+            "Home improvement and gardening",
+            "Sports and fitness equipment",
+            "Beauty and personal care",
+            "Toys and games",
+            "Car parts and accessories",
+            "Food and beverages",
+            "Health and wellness products"
+        ]
+    }
     return categories
 
 def generate_customers(count=100):
     """Generate synthetic customer data"""
-    customers = []
-    for i in range(1, count + 1):
-        customer = {
-            "id": i,
-            "name": fake.name(),
-            "email": fake.email(),
-            "phone": fake.phone_number(),
-            "address": fake.address().replace('\n', ', '),
-            "registration_date": fake.date_between(start_date='-2y', end_date='today').isoformat()
-        }
-        customers.append(customer)
+    
+    # customers.email is UNIQUE and loaded with plain INSERTs, so emails must not repeat
+    fake.unique.clear()
+    
+    # Generate each Faker column in one comprehension rather than per customer
+    customers = {
+        "id": np.arange(1, count + 1),
+        "name": [fake.name() for _ in range(count)],
+        "email": [fake.unique.email() for _ in range(count)],
+        "phone": [fake.phone_number() for _ in range(count)],
+        "address": [fake.address().replace('\n', ', ') for _ in range(count)],
+        "registration_date": [
+            fake.date_between(start_date='-2y', end_date='today').isoformat()
+            for _ in range(count)
+        ]
+    }
     return customers
 
 def generate_products(categories, count=50):
     """Generate synthetic product data"""
-    products = []
     product_names = {
         1: ["Smartphone", "Laptop", "Tablet", "Headphones", "Smart Watch"],
         2: ["T-Shirt", "Jeans", "Dress", "Sneakers", "Jacket"],
@@ -67,71 +81,73 @@ def generate_products(categories, count=50):
         10: ["Vitamins", "First Aid Kit", "Thermometer", "Supplements", "Fitness Tracker"]
     }
     
-    for i in range(1, count + 1):
-        category_id = random.randint(1, 10)
-        category_products = product_names[category_id]
-        
-        product = {
-            "id": i,
-            "name": random.choice(category_products),
-            "category_id": category_id,
-            "price": round(random.uniform(10.0, 500.0), 2),
-            "stock_quantity": random.randint(0, 100),
-            "description": fake.text(max_nb_chars=200)
-        }
-        products.append(product)
+    # Draw each numeric column for every product in one vectorized call
+    names_table = np.array([product_names[category_id] for category_id in sorted(product_names)])
+    category_ids = rng.integers(1, 11, size=count)
+    
+    products = {
+        "id": np.arange(1, count + 1),
+        "name": names_table[category_ids - 1, rng.integers(0, names_table.shape[1], size=count)],
+        "category_id": category_ids,
+        "price": np.round(rng.uniform(10.0, 500.0, size=count), 2),
+        "stock_quantity": rng.integers(0, 101, size=count),
+        "description": [fake.text(max_nb_chars=200) for _ in range(count)]
+    }
     return products
 
 def generate_orders(customers, count=200):
     """Generate synthetic order data"""
-    orders = []
-    statuses = ["pending", "processing", "shipped", "delivered", "cancelled"]
+    statuses = np.array(["pending", "processing", "shipped", "delivered", "cancelled"])
     
-    for i in range(1, count + 1):
-        order_date = fake.date_between(start_date='-1y', end_date='today')
-        order = {
-            "id": i,
-            "customer_id": random.choice(customers)["id"],
-            "order_date": order_date.isoformat(),
-            "total_amount": 0,  # Will be calculated after order items
-            "status": random.choice(statuses)
-        }
-        orders.append(order)
+    orders = {
+        "id": np.arange(1, count + 1),
+        "customer_id": rng.choice(customers["id"], size=count),
+        "order_date": [
+            fake.date_between(start_date='-1y', end_date='today').isoformat()
+            for _ in range(count)
+        ],
+        "total_amount": np.zeros(count),  # Will be calculated after order items
+        "status": statuses[rng.integers(0, len(statuses), size=count)]
+    }
     return orders
 
 def generate_order_items(orders, products):
     """Generate synthetic order items data"""
-    order_items = []
-    item_id = 1
+    order_count = len(orders["id"])
+    
+    # Each order has 1-5 items; draw every item's product and quantity up front
+    items_per_order = rng.integers(1, 6, size=order_count)
+    total_items = int(items_per_order.sum())
+    product_indexes = rng.integers(0, len(products["id"]), size=total_items)
+    quantities = rng.integers(1, 4, size=total_items)
+    unit_prices = products["price"][product_indexes]
+    order_indexes = np.repeat(np.arange(order_count), items_per_order)
     
-    for order in orders:
-        # Each order has 1-5 items
-        num_items = random.randint(1, 5)
-        order_total = 0
-        
-        for _ in range(num_items):
-            product = random.choice(products)
-            quantity = random.randint(1, 3)
-            unit_price = product["price"]
-            
-            order_item = {
-                "id": item_id,
-                "order_id": order["id"],
-                "product_id": product["id"],
-                "quantity": quantity,
-                "unit_price": unit_price
-            }
-            order_items.append(order_item)
-            order_total += quantity * unit_price
-            item_id += 1
-        
-        # Update order total
-        order["total_amount"] = round(order_total, 2)
+    # Sum every order's line totals in a single reduction
+    order_totals = np.bincount(
+        order_indexes, weights=quantities * unit_prices, minlength=order_count
+    )
+    orders["total_amount"] = np.round(order_totals, 2)
     
+    order_items = {
+        "id": np.arange(1, total_items + 1),
+        "order_id": orders["id"][order_indexes],
+        "product_id": products["id"][product_indexes],
+        "quantity": quantities,
+        "unit_price": unit_prices
+    }
     return order_items
 
-def main():
-    """Generate all ecommerce data"""
+def table_records(table):
+    """Convert a columnar table into a list of row dicts"""
+    columns = {
+        name: values.tolist() if isinstance(values, np.ndarray) else values
+        for name, values in table.items()
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+def main(save=True):
+    """Generate all ecommerce data, optionally saving it to ecommerce_data.json"""
     print("Generating synthetic ecommerce data...")
     
     # Generate data
@@ -141,7 +157,6 @@ def main():
     orders = generate_orders(customers, 200)
     order_items = generate_order_items(orders, products)
     
-    # Save to JSON files
     data = {
         "categories": categories,
         "customers": customers,
@@ -150,16 +165,21 @@ def main():
         "order_items": order_items
     }
     
-    with open("ecommerce_data.json", "w") as f:
-        json.dump(data, f, indent=2)
+    # Save to JSON files, one object per row
+    if save:
+        records = {name: table_records(table) for name, table in data.items()}
+        with open("ecommerce_data.json", "wb") as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
     
     print(f"Generated:")
-    print(f"- {len(categories)} categories")
-    print(f"- {len(customers)} customers")
-    print(f"- {len(products)} products")
-    print(f"- {len(orders)} orders")
-    print(f"- {len(order_items)} order items")
-    print("Data saved to ecommerce_data.json")
+    print(f"- {len(categories['id'])} categories")
+    print(f"- {len(customers['id'])} customers")
+    print(f"- {len(products['id'])} products")
+    print(f"- {len(orders['id'])} orders")
+    print(f"- {len(order_items['id'])} order items")
+    if save:
+        print("Data saved to ecommerce_data.json")
+    return data
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -20,31 +20,102 @@ Business questions to answer:
 """
 
 import sqlite3
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+def format_table(columns, rows):
+    """Render query results as right-aligned text columns"""
+    cells = [
+        [f"{value:.2f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths = [
+        max([len(column)] + [len(row[i]) for row in cells])
+        for i, column in enumerate(columns)
+    ]
+    lines = [" ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    for row in cells:
+        lines.append(" ".join(value.rjust(width) for value, width in zip(row, widths)))
+    return "\n".join(lines)
+
 class EcommerceAnalytics:
     def __init__(self, db_path="ecommerce.db"):
         self.db_path = db_path
+        # sqlite3 connections must not be shared between threads, so each thread
+        # opens its own and reuses it (with a warm page cache) for later queries
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    @property
+    def conn(self):
+        """Database connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is off only so close() can run from the main thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every database connection opened by this instance"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _write(self, text):
+        """Print text, or buffer it when called from run_reports"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            print(text)
+        else:
+            buffer.append(text)
+    
+    def _run_buffered(self, report):
+        """Run a report method and return its output lines"""
+        self._local.buffer = []
+        try:
+            report()
+            return self._local.buffer
+        finally:
+            self._local.buffer = None
+    
+    def run_reports(self, reports, max_workers=4):
+        """Run independent report methods concurrently, printing results in order"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._run_buffered, report) for report in reports]
+            for future in futures:
+                for line in future.result():
+                    print(line)
     
     def execute_query(self, query, description):
         """Execute a query and return results with description"""
-        conn = sqlite3.connect(self.db_path)
         try:
-            df = pd.read_sql_query(query, conn)
-            print(f"\n{'='*60}")
-            print(f"QUERY: {description}")
-            print(f"{'='*60}")
-            print(f"SQL:\n{query}")
-            print(f"\nRESULTS:")
-            print(df.to_string(index=False))
-            print(f"\nRows returned: {len(df)}")
-            return df
+            cursor = self.conn.execute(query)
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+            self._write(f"\n{'='*60}")
+            self._write(f"QUERY: {description}")
+            self._write(f"{'='*60}")
+            self._write(f"SQL:\n{query}")
+            self._write(f"\nRESULTS:")
+            self._write(format_table(columns, rows))
+            self._write(f"\nRows returned: {len(rows)}")
+            return rows
         except Exception as e:
-            print(f"Error executing query: {e}")
+            self._write(f"Error executing query: {e}")
             return None
-        finally:
-            conn.close()
     
     def top_customers_by_revenue(self):
         """Find top 10 customers by total purchase amount"""
@@ -83,19 +154,23 @@ class EcommerceAnalytics:
             INNER JOIN orders o ON oi.order_id = o.id
             WHERE o.status != 'cancelled'
             GROUP BY p.id, p.name, c.name
-        ),
-        ranked_products AS (
-            SELECT *,
-                ROW_NUMBER() OVER (PARTITION BY category_name ORDER BY total_revenue DESC) as rank
-            FROM product_sales
         )
         SELECT 
             category_name,
-            name as product_name,
+            product_name,
             total_quantity_sold,
             total_revenue,
             orders_count
-        FROM ranked_products
+        FROM (
+            SELECT 
+                category_name,
+                name as product_name,
+                total_quantity_sold,
+                total_revenue,
+                orders_count,
+                ROW_NUMBER() OVER (PARTITION BY category_name ORDER BY total_revenue DESC) as rank
+            FROM product_sales
+        )
         WHERE rank <= 3
         ORDER BY category_name, rank
         """
@@ -105,7 +180,7 @@ class EcommerceAnalytics:
         """Analyze monthly sales trends"""
         query = """
         SELECT 
-            strftime('%Y-%m', o.order_date) as month,
+            o.order_month as month,
             COUNT(o.id) as total_orders,
             COUNT(DISTINCT o.customer_id) as unique_customers,
             SUM(o.total_amount) as total_revenue,
@@ -114,7 +189,7 @@ class EcommerceAnalytics:
         FROM orders o
         INNER JOIN order_items oi ON o.id = oi.order_id
         WHERE o.status != 'cancelled'
-        GROUP BY strftime('%Y-%m', o.order_date)
+        GROUP BY o.order_month
         ORDER BY month DESC
         LIMIT 12
         """
@@ -197,7 +272,7 @@ class EcommerceAnalytics:
         query = """
         SELECT 
             c.name as category,
-            strftime('%Y-%m', o.order_date) as month,
+            o.order_month as month,
             COUNT(DISTINCT o.id) as orders_count,
             SUM(oi.quantity) as items_sold,
             SUM(oi.quantity * oi.unit_price) as revenue,
@@ -208,7 +283,7 @@ class EcommerceAnalytics:
         INNER JOIN order_items oi ON p.id = oi.product_id
         INNER JOIN orders o ON oi.order_id = o.id
         WHERE o.status != 'cancelled'
-        GROUP BY c.name, strftime('%Y-%m', o.order_date)
+        GROUP BY c.name, o.order_month
         HAVING revenue > 0
         ORDER BY month DESC, revenue DESC
         """
@@ -217,16 +292,29 @@ class EcommerceAnalytics:
     def cross_selling_analysis(self):
         """Find products frequently bought together"""
         query = """
-        WITH order_product_pairs AS (
+        WITH order_products AS (
             SELECT DISTINCT
-                oi1.product_id as product1_id,
-                oi2.product_id as product2_id,
-                oi1.order_id
-            FROM order_items oi1
-            INNER JOIN order_items oi2 ON oi1.order_id = oi2.order_id
-            INNER JOIN orders o ON oi1.order_id = o.id
-            WHERE oi1.product_id < oi2.product_id
-            AND o.status != 'cancelled'
+                oi.order_id,
+                oi.product_id
+            FROM order_items oi
+            INNER JOIN orders o ON oi.order_id = o.id
+            WHERE o.status != 'cancelled'
+        ),
+        order_product_pairs AS (
+            SELECT 
+                op1.product_id as product1_id,
+                op2.product_id as product2_id,
+                op1.order_id
+            FROM order_products op1
+            INNER JOIN order_products op2 ON op1.order_id = op2.order_id
+            WHERE op1.product_id < op2.product_id
+        ),
+        product_order_counts AS (
+            SELECT 
+                product_id,
+                COUNT(DISTINCT order_id) as orders_count
+            FROM order_items
+            GROUP BY product_id
         )
         SELECT 
             p1.name as product1,
@@ -234,17 +322,14 @@ class EcommerceAnalytics:
             c1.name as category1,
             c2.name as category2,
             COUNT(*) as times_bought_together,
-            ROUND(COUNT(*) * 100.0 / (
-                SELECT COUNT(DISTINCT order_id) 
-                FROM order_items 
-                WHERE product_id = p1.id
-            ), 2) as cross_sell_rate_percent
+            ROUND(COUNT(*) * 100.0 / poc.orders_count, 2) as cross_sell_rate_percent
         FROM order_product_pairs opp
+        INNER JOIN product_order_counts poc ON opp.product1_id = poc.product_id
         INNER JOIN products p1 ON opp.product1_id = p1.id
         INNER JOIN products p2 ON opp.product2_id = p2.id
         INNER JOIN categories c1 ON p1.category_id = c1.id
         INNER JOIN categories c2 ON p2.category_id = c2.id
-        GROUP BY p1.id, p2.id, p1.name, p2.name, c1.name, c2.name
+        GROUP BY p1.id, p2.id, p1.name, p2.name, c1.name, c2.name, poc.orders_count
         HAVING times_bought_together >= 3
         ORDER BY times_bought_together DESC
         LIMIT 15
@@ -256,29 +341,32 @@ def main():
     
     # Check if database exists
     try:
-        analytics = EcommerceAnalytics()
-        
-        print("ECOMMERCE DATABASE ANALYTICS REPORT")
-        print("Generated on:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        # Run all analytics
-        analytics.top_customers_by_revenue()
-        analytics.best_selling_products_by_category()
-        analytics.monthly_sales_trends()
-        analytics.customer_order_frequency_analysis()
-        analytics.product_performance_metrics()
-        analytics.revenue_analysis_by_category_and_period()
-        analytics.cross_selling_analysis()
+        with EcommerceAnalytics() as analytics:
+            print("ECOMMERCE DATABASE ANALYTICS REPORT")
+            print("Generated on:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            
+            # Run all analytics; the queries are read-only and independent
+            analytics.run_reports([
+                analytics.top_customers_by_revenue,
+                analytics.best_selling_products_by_category,
+                analytics.monthly_sales_trends,
+                analytics.customer_order_frequency_analysis,
+                analytics.product_performance_metrics,
+                analytics.revenue_analysis_by_category_and_period,
+                analytics.cross_selling_analysis
+            ])
         
         print(f"\n{'='*60}")
         print("ANALYTICS REPORT COMPLETED")
         print(f"{'='*60}")
+        return True
         
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure to run the data generation and ingestion scripts first:")
         print("1. python generate_ecommerce_data.py")
         print("2. python ingest_to_database.py")
+        return False
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -12,28 +12,56 @@ Tables to create:
 - categories (id, name, description)
 - customers (id, name, email, phone, address, registration_date)
 - products (id, name, category_id, price, stock_quantity, description)
-- orders (id, customer_id, order_date, total_amount, status)
+- orders (id, customer_id, order_date, total_amount, status, order_month)
 - order_items (id, order_id, product_id, quantity, unit_price)
 """
 
+import itertools
 import sqlite3
-import json
 from datetime import datetime
 
+# Shared by create_database_schema and recreate_legacy_orders_table
+ORDERS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER NOT NULL,
+            order_date DATE NOT NULL,
+            total_amount DECIMAL(10,2) NOT NULL CHECK (total_amount >= 0),
+            status VARCHAR(50) NOT NULL,
+            order_month TEXT GENERATED ALWAYS AS (strftime('%Y-%m', order_date)) STORED,
+            FOREIGN KEY (customer_id) REFERENCES customers(id)
+        )
+"""
+
+def configure_bulk_load(cursor):
+    """Tune connection PRAGMAs for a fast bulk load"""
+    
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+        # Skip per-row foreign key probing while loading; re-enabled afterwards
+        "PRAGMA foreign_keys=OFF"
+    ]
+    
+    for pragma_sql in pragmas:
+        cursor.execute(pragma_sql)
+
 def create_database_schema(cursor):
     """Create database tables with proper schema"""
     
-    # Categories table
-    cursor.execute("""
+    # All tables are created by a single script in one parser invocation
+    cursor.executescript("""
+        -- Categories table
         CREATE TABLE IF NOT EXISTS categories (
             id INTEGER PRIMARY KEY,
             name VARCHAR(100) NOT NULL UNIQUE,
             description TEXT
-        )
-    """)
-    
-    # Customers table
-    cursor.execute("""
+        );
+        
+        -- Customers table
         CREATE TABLE IF NOT EXISTS customers (
             id INTEGER PRIMARY KEY,
             name VARCHAR(200) NOT NULL,
@@ -41,11 +69,9 @@ def create_database_schema(cursor):
             phone VARCHAR(50),
             address TEXT,
             registration_date DATE NOT NULL
-        )
-    """)
-    
-    # Products table
-    cursor.execute("""
+        );
+        
+        -- Products table
         CREATE TABLE IF NOT EXISTS products (
             id INTEGER PRIMARY KEY,
             name VARCHAR(200) NOT NULL,
@@ -54,23 +80,12 @@ def create_database_schema(cursor):
             stock_quantity INTEGER NOT NULL CHECK (stock_quantity >= 0),
             description TEXT,
             FOREIGN KEY (category_id) REFERENCES categories(id)
-        )
-    """)
-    
-    # Orders table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS orders (
-            id INTEGER PRIMARY KEY,
-            customer_id INTEGER NOT NULL,
-            order_date DATE NOT NULL,
-            total_amount DECIMAL(10,2) NOT NULL CHECK (total_amount >= 0),
-            status VARCHAR(50) NOT NULL,
-            FOREIGN KEY (customer_id) REFERENCES customers(id)
-        )
-    """)
-    
-    # Order items table
-    cursor.execute("""
+        );
+        
+        -- Orders table
+        """ + ORDERS_TABLE_SQL + """;
+        
+        -- Order items table
         CREATE TABLE IF NOT EXISTS order_items (
             id INTEGER PRIMARY KEY,
             order_id INTEGER NOT NULL,
@@ -79,73 +94,136 @@ def create_database_schema(cursor):
             unit_price DECIMAL(10,2) NOT NULL CHECK (unit_price >= 0),
             FOREIGN KEY (order_id) REFERENCES orders(id),
             FOREIGN KEY (product_id) REFERENCES products(id)
-        )
+        );
     """)
 
+def recreate_legacy_orders_table(cursor):
+    """Recreate an orders table from before order_month existed"""
+    
+    # ALTER TABLE cannot add a STORED column, and the load empties every table
+    # anyway. Must run inside the load transaction (plain execute, not
+    # executescript, which commits first) so a failed load restores the old table.
+    cursor.execute("PRAGMA table_xinfo(orders)")
+    if "order_month" not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute("DROP TABLE orders")
+        cursor.execute(ORDERS_TABLE_SQL)
+
 def create_indexes(cursor):
     """Create indexes for better query performance"""
     
     indexes = [
         "CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id)",
-        "CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_id)",
         "CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(order_date)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_month ON orders(order_month)",
+        # Covers the top-customers aggregation without visiting the orders table
+        "CREATE INDEX IF NOT EXISTS idx_orders_cust_status_amt ON orders(customer_id, status, total_amount, order_date)",
         "CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id)",
         "CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items(product_id)",
         "CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email)"
     ]
     
-    for index_sql in indexes:
-        cursor.execute(index_sql)
+    cursor.executescript(";\n".join(indexes) + ";")
+
+def drop_indexes(cursor):
+    """Drop the secondary idx_* indexes so the load does not maintain them row by row"""
+    
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name GLOB 'idx_*'")
+    for (index_name,) in cursor.fetchall():
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+def clear_tables(cursor):
+    """Empty every table, children first, so the load can use plain INSERTs"""
+    
+    tables = ["order_items", "orders", "products", "customers", "categories"]
+    
+    for table in tables:
+        cursor.execute(f"DELETE FROM {table}")
+
+def column_values(values, chunk_size=65536):
+    """Iterate a column as plain Python values SQLite can bind"""
+    # NumPy columns are converted with tolist() one chunk at a time, keeping
+    # the C-level conversion without copying the whole array into one list
+    if hasattr(values, "tolist"):
+        return itertools.chain.from_iterable(
+            values[start:start + chunk_size].tolist()
+            for start in range(0, len(values), chunk_size)
+        )
+    return iter(values)
+
+def table_rows(table, columns):
+    """Lazily zip the given columns of a columnar table into row tuples"""
+    # executemany consumes the rows one at a time, so at most one chunk per column is held
+    return zip(*(column_values(table[column]) for column in columns))
 
 def insert_data(cursor, data):
-    """Insert data into database tables"""
+    """Insert columnar data ({column_name: values} per table) into database tables"""
     
     # Insert categories
-    for category in data["categories"]:
-        cursor.execute("""
-            INSERT OR REPLACE INTO categories (id, name, description)
-            VALUES (?, ?, ?)
-        """, (category["id"], category["name"], category["description"]))
+    cursor.executemany("""
+        INSERT INTO categories (id, name, description)
+        VALUES (?, ?, ?)
+    """, table_rows(data["categories"], ["id", "name", "description"]))
     
     # Insert customers
-    for customer in data["customers"]:
-        cursor.execute("""
-            INSERT OR REPLACE INTO customers (id, name, email, phone, address, registration_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            customer["id"], customer["name"], customer["email"],
-            customer["phone"], customer["address"], customer["registration_date"]
-        ))
+    cursor.executemany("""
+        INSERT INTO customers (id, name, email, phone, address, registration_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, table_rows(
+        data["customers"],
+        ["id", "name", "email", "phone", "address", "registration_date"]
+    ))
     
     # Insert products
-    for product in data["products"]:
-        cursor.execute("""
-            INSERT OR REPLACE INTO products (id, name, category_id, price, stock_quantity, description)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            product["id"], product["name"], product["category_id"],
-            product["price"], product["stock_quantity"], product["description"]
-        ))
+    cursor.executemany("""
+        INSERT INTO products (id, name, category_id, price, stock_quantity, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, table_rows(
+        data["products"],
+        ["id", "name", "category_id", "price", "stock_quantity", "description"]
+    ))
     
     # Insert orders
-    for order in data["orders"]:
-        cursor.execute("""
-            INSERT OR REPLACE INTO orders (id, customer_id, order_date, total_amount, status)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            order["id"], order["customer_id"], order["order_date"],
-            order["total_amount"], order["status"]
-        ))
+    cursor.executemany("""
+        INSERT INTO orders (id, customer_id, order_date, total_amount, status)
+        VALUES (?, ?, ?, ?, ?)
+    """, table_rows(
+        data["orders"],
+        ["id", "customer_id", "order_date", "total_amount", "status"]
+    ))
     
     # Insert order items
-    for item in data["order_items"]:
-        cursor.execute("""
-            INSERT OR REPLACE INTO order_items (id, order_id, product_id, quantity, unit_price)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            item["id"], item["order_id"], item["product_id"],
-            item["quantity"], item["unit_price"]
-        ))
+    cursor.executemany("""
+        INSERT INTO order_items (id, order_id, product_id, quantity, unit_price)
+        VALUES (?, ?, ?, ?, ?)
+    """, table_rows(
+        data["order_items"],
+        ["id", "order_id", "product_id", "quantity", "unit_price"]
+    ))
+
+def insert_json_data(cursor, json_text):
+    """Insert data straight from the raw JSON document using SQLite's json_each"""
+    
+    # Tables in foreign key order, with the JSON keys copied into each column
+    tables = [
+        ("categories", ["id", "name", "description"]),
+        ("customers", ["id", "name", "email", "phone", "address", "registration_date"]),
+        ("products", ["id", "name", "category_id", "price", "stock_quantity", "description"]),
+        ("orders", ["id", "customer_id", "order_date", "total_amount", "status"]),
+        ("order_items", ["id", "order_id", "product_id", "quantity", "unit_price"])
+    ]
+    
+    # Split the document into its per-table arrays with a single parse, so each
+    # INSERT below only parses its own table's array
+    cursor.execute("SELECT key, value FROM json_each(?)", (json_text,))
+    table_arrays = dict(cursor.fetchall())
+    
+    for table, columns in tables:
+        extracts = ", ".join(f"json_extract(value, '$.{column}')" for column in columns)
+        cursor.execute(f"""
+            INSERT INTO {table} ({", ".join(columns)})
+            SELECT {extracts}
+            FROM json_each(?)
+        """, (table_arrays[table],))
 
 def verify_data_integrity(cursor):
     """Verify data was inserted correctly"""
@@ -177,42 +255,58 @@ def verify_data_integrity(cursor):
     print(f"- Orphaned products: {orphaned_products}")
     print(f"- Orphaned orders: {orphaned_orders}")
 
-def main():
-    """Main function to create database and ingest data"""
+def main(data=None):
+    """Main function to create database and ingest data, from memory when given"""
     
-    # Load the generated data
-    try:
-        with open("ecommerce_data.json", "r") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print("Error: ecommerce_data.json not found. Please run generate_ecommerce_data.py first.")
-        return
+    # Load the generated data as raw text; SQLite parses it during the insert
+    if data is None:
+        try:
+            with open("ecommerce_data.json", "r") as f:
+                json_text = f.read()
+        except FileNotFoundError:
+            print("Error: ecommerce_data.json not found. Please run generate_ecommerce_data.py first.")
+            return False
     
     # Connect to SQLite database
     conn = sqlite3.connect("ecommerce.db")
     cursor = conn.cursor()
     
     try:
+        configure_bulk_load(cursor)
+        
         print("Creating database schema...")
         create_database_schema(cursor)
         
-        print("Creating indexes...")
-        create_indexes(cursor)
-        
         print("Inserting data...")
-        insert_data(cursor, data)
+        # Load every table inside a single write transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        recreate_legacy_orders_table(cursor)
+        drop_indexes(cursor)
+        clear_tables(cursor)
+        if data is None:
+            insert_json_data(cursor, json_text)
+        else:
+            insert_data(cursor, data)
         
         # Commit changes
         conn.commit()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        
+        # Rebuild secondary indexes in one pass over the populated tables
+        print("Creating indexes...")
+        create_indexes(cursor)
+        conn.commit()
         
         print("Data ingestion completed successfully!")
         
         # Verify data
         verify_data_integrity(cursor)
+        return True
         
     except Exception as e:
         print(f"Error during data ingestion: {e}")
         conn.rollback()
+        return False
     
     finally:
         conn.close()
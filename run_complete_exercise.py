@@ -8,37 +8,26 @@ This script runs the complete exercise:
 3. Runs complex SQL queries with joins and analytics
 """
 
-import subprocess
-import sys
 import os
 
-def run_script(script_name, description):
-    """Run a Python script and handle errors"""
+def run_step(step, description):
+    """Run an exercise stage in-process and handle errors"""
     print(f"\n{'='*60}")
     print(f"STEP: {description}")
     print(f"{'='*60}")
     
     try:
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=True, text=True, check=True)
-        print(result.stdout)
-        if result.stderr:
-            print("Warnings:", result.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {script_name}:")
-        print(f"Return code: {e.returncode}")
-        print(f"Error output: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print(f"Error: {script_name} not found!")
+        return step()
+    except Exception as e:
+        print(f"Error during {description}: {e}")
         return False
 
 def check_requirements():
     """Check if required packages are installed"""
     try:
         import faker
-        import pandas
+        import numpy
+        import orjson
         print("✓ All required packages are installed")
         return True
     except ImportError as e:
@@ -55,23 +44,28 @@ def main():
     if not check_requirements():
         return
     
-    # Step 1: Generate synthetic data
-    success = run_script("generate_ecommerce_data.py", 
-                        "Generating Synthetic Ecommerce Data")
-    if not success:
+    # Import stages only once the requirements check has passed
+    from generate_ecommerce_data import main as generate_data
+    from ingest_to_database import main as ingest_data
+    from generate_sql_queries import main as run_analytics
+    
+    # Step 1: Generate synthetic data, kept in memory for the ingest step
+    data = run_step(lambda: generate_data(save=False), 
+                   "Generating Synthetic Ecommerce Data")
+    if not data:
         print("Failed to generate data. Stopping.")
         return
     
     # Step 2: Ingest data into database
-    success = run_script("ingest_to_database.py", 
-                        "Ingesting Data into SQLite Database")
+    success = run_step(lambda: ingest_data(data), 
+                      "Ingesting Data into SQLite Database")
     if not success:
         print("Failed to ingest data. Stopping.")
         return
     
     # Step 3: Run analytics queries
-    success = run_script("generate_sql_queries.py", 
-                        "Running SQL Analytics Queries")
+    success = run_step(run_analytics, 
+                      "Running SQL Analytics Queries")
     if not success:
         print("Failed to run queries. Stopping.")
         return
@@ -80,7 +74,6 @@ def main():
     print("EXERCISE COMPLETED SUCCESSFULLY!")
     print(f"{'='*60}")
     print("\nFiles created:")
-    print("- ecommerce_data.json (synthetic data)")
     print("- ecommerce.db (SQLite database)")
     print("\nScripts available:")
     print("- generate_ecommerce_data.py")